@@ -1,184 +1,425 @@
+import hashlib
 import requests
-from flask import Flask, render_template_string
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from flask import Flask, make_response, request
+from jinja2 import DictLoader, FileSystemBytecodeCache
 from datetime import datetime
 import os
-from urllib.parse import quote, unquote
+import threading
+import time
+from urllib.parse import unquote
 
 app = Flask(__name__)
 
+# Templates are compiled once at import, never reloaded from disk
+app.config['TEMPLATES_AUTO_RELOAD'] = False
+app.jinja_env.auto_reload = False
+
 # Get API backend URL from environment or default to localhost
 API_BASE_URL = os.getenv('API_BASE_URL', 'http://localhost:8000')
 FRONTEND_BASE_URL = os.getenv('FRONTEND_BASE_URL', 'https://inferline.cloudrift.ai')
 
-def get_models():
-    """Fetch models from the API backend"""
+# Shared session so requests to the API backend reuse keep-alive connections.
+# Only connection failures are retried: a hung backend must not be waited on twice.
+SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10,
+                       max_retries=Retry(total=2, connect=2, read=0, status=0, other=0))
+SESSION.mount('http://', _adapter)
+SESSION.mount('https://', _adapter)
+
+# (connect, read) timeouts for API backend calls; with the retries above the worst
+# case stays under 10 seconds: 3 connects x 1.5s + one 5s read
+API_TIMEOUT = (1.5, 5.0)
+
+# How long (seconds) a fetched model list is served from memory
+MODELS_CACHE_TTL = float(os.getenv('MODELS_CACHE_TTL', '3.0'))
+
+# How long (seconds) browsers and proxies may reuse a rendered page
+PAGE_CACHE_MAX_AGE = int(os.getenv('PAGE_CACHE_MAX_AGE', '5'))
+
+_models_cache_lock = threading.Lock()
+_models_cache_ts = float('-inf')
+_models_cache_data = []
+_models_cache_etag = None
+_models_cache_refreshing = False
+
+def get_models_snapshot():
+    """Fetch models from the API backend along with an ETag of the payload.
+
+    Results, including failures, are cached for MODELS_CACHE_TTL seconds; the
+    ETag is None when the fetch failed. Only one thread refreshes at a time and
+    the others are served the previous snapshot meanwhile, so a slow backend
+    never queues page requests behind each other.
+    """
+    global _models_cache_ts, _models_cache_data, _models_cache_etag, _models_cache_refreshing
+
+    with _models_cache_lock:
+        if _models_cache_refreshing or time.monotonic() - _models_cache_ts < MODELS_CACHE_TTL:
+            return _models_cache_data, _models_cache_etag
+        _models_cache_refreshing = True
+
+    data, etag = [], None
     try:
-        response = requests.get(f"{API_BASE_URL}/models", timeout=10)
+        response = SESSION.get(f"{API_BASE_URL}/models", timeout=API_TIMEOUT)
         response.raise_for_status()
         data = response.json()['data']
-        return data
+        etag = hashlib.md5(response.content).hexdigest()
     except Exception as e:
         print(f"Error fetching models: {e}")
         print(f"API_BASE_URL: {API_BASE_URL}")
-        return []
+        data, etag = [], None
+    finally:
+        with _models_cache_lock:
+            _models_cache_data = data
+            _models_cache_etag = etag
+            _models_cache_ts = time.monotonic()
+            _models_cache_refreshing = False
+    return data, etag
 
-@app.route('/')
-def home():
-    """Frontend homepage showing available models"""
-    models = get_models()
+def get_models():
+    """Fetch models from the API backend, cached for MODELS_CACHE_TTL seconds"""
+    return get_models_snapshot()[0]
+
+def format_token_count(value):
+    """Format a token count with thousands separators"""
+    return f"{value:,}" if isinstance(value, int) else 'Unknown'
+
+def cached_page(etag, render):
+    """Build a page response with caching headers.
+
+    If the client already holds the page for ``etag`` a 304 is returned
+    without calling ``render``. Pages without an ETag are not cached.
+    """
+    if etag is not None and request.if_none_match.contains(etag):
+        response = make_response('', 304)
+    else:
+        response = make_response(render())
     
-    # Create model cards HTML
-    model_cards = ""
-    for model in models:
-        provider_name = getattr(model, 'provider_name', model.get('owned_by', 'unknown'))
-        model_cards += f"""
+    if etag is not None:
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = f'public, max-age={PAGE_CACHE_MAX_AGE}'
+    return response
+
+
+HOME_HTML = """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>InferLine API - Available Models</title>
+    <style>
+        body {
+            font-family: Arial, sans-serif;
+            max-width: 1200px;
+            margin: 0 auto;
+            padding: 20px;
+            background-color: #f5f5f5;
+        }
+        .header {
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: white;
+            padding: 30px;
+            border-radius: 10px;
+            text-align: center;
+            margin-bottom: 30px;
+        }
+        .header h1 {
+            margin: 0;
+            font-size: 2.5em;
+        }
+        .header p {
+            margin: 10px 0 0 0;
+            font-size: 1.2em;
+            opacity: 0.9;
+        }
+        .models-grid {
+            display: grid;
+            grid-template-columns: repeat(auto-fill, minmax(350px, 1fr));
+            gap: 20px;
+            margin-bottom: 30px;
+        }
+        .model-card {
+            background: white;
+            border-radius: 10px;
+            padding: 20px;
+            box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+            transition: transform 0.2s, box-shadow 0.2s;
+        }
+        .model-card:hover {
+            transform: translateY(-5px);
+            box-shadow: 0 8px 15px rgba(0, 0, 0, 0.2);
+        }
+        .model-card h3 {
+            margin: 0 0 15px 0;
+            color: #333;
+            font-size: 1.4em;
+        }
+        .model-card p {
+            margin: 8px 0;
+            color: #666;
+        }
+        .btn {
+            display: inline-block;
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: white;
+            padding: 10px 20px;
+            text-decoration: none;
+            border-radius: 5px;
+            margin-top: 15px;
+            transition: transform 0.2s;
+        }
+        .btn:hover {
+            transform: translateY(-2px);
+        }
+        .no-models {
+            text-align: center;
+            color: #666;
+            font-style: italic;
+            padding: 40px;
+        }
+        .footer {
+            text-align: center;
+            margin-top: 40px;
+            padding: 20px;
+            color: #666;
+            border-top: 1px solid #ddd;
+        }
+        .api-links {
+            background: white;
+            padding: 20px;
+            border-radius: 10px;
+            margin-bottom: 20px;
+            box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
+        }
+        .api-links h3 {
+            margin: 0 0 15px 0;
+            color: #333;
+        }
+        .api-links a {
+            display: inline-block;
+            margin: 5px 10px 5px 0;
+            padding: 8px 15px;
+            background: #f8f9fa;
+            color: #495057;
+            text-decoration: none;
+            border-radius: 5px;
+            border: 1px solid #dee2e6;
+        }
+        .api-links a:hover {
+            background: #e9ecef;
+        }
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>InferLine API</h1>
+        <p>OpenAI-compatible API server for LLM inference routing</p>
+    </div>
+
+    <div class="api-links">
+        <h3>API Endpoints</h3>
+        <a href="/api/docs" target="_blank">API Documentation</a>
+        <a href="/api/models" target="_blank">Models JSON</a>
+        <a href="/api/queue/stats" target="_blank">Queue Stats</a>
+        <a href="/api/health" target="_blank">Health Check</a>
+    </div>
+
+    <h2>Available Models ({{ model_count }})</h2>
+    <div class="models-grid">
+        {% for m in models %}
         <div class="model-card">
-            <h3>{model['id']}</h3>
-            <p><strong>Provider:</strong> {provider_name}</p>
-            <p><strong>Description:</strong> {model.get('description', 'No description available')}</p>
-            <p><strong>Context Length:</strong> {model.get('context_length', 'Unknown'):,}</p>
-            <a href="/model/{quote(model['id'], safe='')}" class="btn">View API Instructions</a>
-        </div>
-        """
-    
-    if not models:
-        model_cards = "<p class='no-models'>No models currently available. Providers will register models when they connect.</p>"
-    
-    html_template = """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>InferLine API - Available Models</title>
-        <style>
-            body {
-                font-family: Arial, sans-serif;
-                max-width: 1200px;
-                margin: 0 auto;
-                padding: 20px;
-                background-color: #f5f5f5;
-            }
-            .header {
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                color: white;
-                padding: 30px;
-                border-radius: 10px;
-                text-align: center;
-                margin-bottom: 30px;
-            }
-            .header h1 {
-                margin: 0;
-                font-size: 2.5em;
-            }
-            .header p {
-                margin: 10px 0 0 0;
-                font-size: 1.2em;
-                opacity: 0.9;
-            }
-            .models-grid {
-                display: grid;
-                grid-template-columns: repeat(auto-fill, minmax(350px, 1fr));
-                gap: 20px;
-                margin-bottom: 30px;
-            }
-            .model-card {
-                background: white;
-                border-radius: 10px;
-                padding: 20px;
-                box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-                transition: transform 0.2s, box-shadow 0.2s;
-            }
-            .model-card:hover {
-                transform: translateY(-5px);
-                box-shadow: 0 8px 15px rgba(0, 0, 0, 0.2);
-            }
-            .model-card h3 {
-                margin: 0 0 15px 0;
-                color: #333;
-                font-size: 1.4em;
-            }
-            .model-card p {
-                margin: 8px 0;
-                color: #666;
-            }
-            .btn {
-                display: inline-block;
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                color: white;
-                padding: 10px 20px;
-                text-decoration: none;
-                border-radius: 5px;
-                margin-top: 15px;
-                transition: transform 0.2s;
-            }
-            .btn:hover {
-                transform: translateY(-2px);
-            }
-            .no-models {
-                text-align: center;
-                color: #666;
-                font-style: italic;
-                padding: 40px;
-            }
-            .footer {
-                text-align: center;
-                margin-top: 40px;
-                padding: 20px;
-                color: #666;
-                border-top: 1px solid #ddd;
-            }
-            .api-links {
-                background: white;
-                padding: 20px;
-                border-radius: 10px;
-                margin-bottom: 20px;
-                box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
-            }
-            .api-links h3 {
-                margin: 0 0 15px 0;
-                color: #333;
-            }
-            .api-links a {
-                display: inline-block;
-                margin: 5px 10px 5px 0;
-                padding: 8px 15px;
-                background: #f8f9fa;
-                color: #495057;
-                text-decoration: none;
-                border-radius: 5px;
-                border: 1px solid #dee2e6;
-            }
-            .api-links a:hover {
-                background: #e9ecef;
-            }
-        </style>
-    </head>
-    <body>
-        <div class="header">
-            <h1>InferLine API</h1>
-            <p>OpenAI-compatible API server for LLM inference routing</p>
+            <h3>{{ m.id }}</h3>
+            <p><strong>Provider:</strong> {{ m.get('owned_by', 'unknown') }}</p>
+            <p><strong>Description:</strong> {{ m.get('description', 'No description available') }}</p>
+            <p><strong>Context Length:</strong> {{ "{:,}".format(m.context_length) if m.context_length is number else 'Unknown' }}</p>
+            <a href="/model/{{ m.id|urlencode }}" class="btn">View API Instructions</a>
         </div>
-        
-        <div class="api-links">
-            <h3>API Endpoints</h3>
-            <a href="/api/docs" target="_blank">API Documentation</a>
-            <a href="/api/models" target="_blank">Models JSON</a>
-            <a href="/api/queue/stats" target="_blank">Queue Stats</a>
-            <a href="/api/health" target="_blank">Health Check</a>
-        </div>
-        
-        <h2>Available Models ({{ model_count }})</h2>
-        <div class="models-grid">
-            {{ model_cards|safe }}
-        </div>
-        
-        <div class="footer">
-            <p>InferLine API Server - Real-time model availability based on connected providers</p>
-        </div>
-    </body>
-    </html>
-    """
+        {% else %}
+        <p class='no-models'>No models currently available. Providers will register models when they connect.</p>
+        {% endfor %}
+    </div>
+
+    <div class="footer">
+        <p>InferLine API Server - Real-time model availability based on connected providers</p>
+    </div>
+</body>
+</html>
+"""
+
+MODEL_HTML = """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>InferLine API - {{ decoded_model_id }}</title>
+    <style>
+        body {
+            font-family: Arial, sans-serif;
+            max-width: 1000px;
+            margin: 0 auto;
+            padding: 20px;
+            background-color: #f5f5f5;
+        }
+        .header {
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: white;
+            padding: 30px;
+            border-radius: 10px;
+            text-align: center;
+            margin-bottom: 30px;
+        }
+        .back-link {
+            display: inline-block;
+            color: white;
+            text-decoration: none;
+            margin-bottom: 10px;
+            opacity: 0.9;
+        }
+        .back-link:hover {
+            opacity: 1;
+        }
+        .model-info {
+            background: white;
+            padding: 25px;
+            border-radius: 10px;
+            margin-bottom: 25px;
+            box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+        }
+        .code-block {
+            background: #2d3748;
+            color: #e2e8f0;
+            padding: 20px;
+            border-radius: 8px;
+            overflow-x: auto;
+            margin: 15px 0;
+            font-family: 'Courier New', monospace;
+        }
+        .section {
+            background: white;
+            padding: 25px;
+            border-radius: 10px;
+            margin-bottom: 25px;
+            box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+        }
+        .section h3 {
+            margin: 0 0 20px 0;
+            color: #333;
+            border-bottom: 2px solid #667eea;
+            padding-bottom: 10px;
+        }
+        .param-table {
+            width: 100%;
+            border-collapse: collapse;
+            margin-top: 15px;
+        }
+        .param-table th, .param-table td {
+            border: 1px solid #ddd;
+            padding: 12px;
+            text-align: left;
+        }
+        .param-table th {
+            background-color: #f8f9fa;
+            font-weight: bold;
+        }
+        .highlight {
+            background-color: #fff3cd;
+            padding: 15px;
+            border-radius: 5px;
+            border-left: 4px solid #ffc107;
+            margin: 15px 0;
+        }
+    </style>
+</head>
+<body>
+    <div class="header">
+        <a href="/" class="back-link">← Back to Models</a>
+        <h1>{{ decoded_model_id }}</h1>
+        <p>API Usage Instructions</p>
+    </div>
+
+    <div class="model-info">
+        <h3>Model Information</h3>
+        <p><strong>Model ID:</strong> {{ decoded_model_id }}</p>
+        <p><strong>Provider:</strong> {{ provider_name }}</p>
+        <p><strong>Description:</strong> {{ description }}</p>
+        <p><strong>Context Length:</strong> {{ context_length }} tokens</p>
+        <p><strong>Max Output Length:</strong> {{ max_output_length }} tokens</p>
+        <p><strong>Created:</strong> {{ created_date }}</p>
+    </div>
+
+    <div class="section">
+        <h3>cURL Example</h3>
+        <div class="code-block">curl -X POST "{{ base_url }}/api/completions" -H "Content-Type: application/json" -d '{ "model": "{{ decoded_model_id }}", "prompt": "Hello, how are you?" }'</div>
+    </div>
+
+    <div class="section">
+        <h3>Request Parameters</h3>
+        <table class="param-table">
+            <tr>
+                <th>Parameter</th>
+                <th>Type</th>
+                <th>Required</th>
+                <th>Description</th>
+            </tr>
+            <tr>
+                <td>model</td>
+                <td>string</td>
+                <td>Yes</td>
+                <td>The model ID to use for completion</td>
+            </tr>
+            <tr>
+                <td>prompt</td>
+                <td>string</td>
+                <td>Yes</td>
+                <td>The text prompt to complete</td>
+            </tr>
+            <tr>
+                <td>max_tokens</td>
+                <td>integer</td>
+                <td>No</td>
+                <td>Maximum number of tokens to generate (optional)</td>
+            </tr>
+            <tr>
+                <td>temperature</td>
+                <td>float</td>
+                <td>No</td>
+                <td>Sampling temperature (optional, 0.0-2.0)</td>
+            </tr>
+        </table>
+    </div>
+
+    <div class="highlight">
+        <strong>Note:</strong> This is a queued inference system. Requests may take some time to process depending on provider availability and queue status. Check <a href="/api/queue/stats" target="_blank">queue statistics</a> for current load.
+    </div>
+</body>
+</html>
+"""
+
+# Compile templates once at import; render_template_string recompiles on every call.
+# They are served through a loader (not from_string) so the bytecode cache applies
+# and restarted workers skip the Jinja compiler.
+# Without JINJA_CACHE_DIR Jinja picks its own per-user directory and checks its
+# ownership and permissions. A cache that cannot be set up is skipped.
+app.jinja_loader = DictLoader({'home.html': HOME_HTML, 'model.html': MODEL_HTML})
+JINJA_CACHE_DIR = os.getenv('JINJA_CACHE_DIR')
+try:
+    if JINJA_CACHE_DIR:
+        os.makedirs(JINJA_CACHE_DIR, mode=0o700, exist_ok=True)
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(JINJA_CACHE_DIR)
+    else:
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache()
+except (OSError, RuntimeError) as e:
+    print(f"Jinja bytecode cache disabled: {e}")
+
+HOME_TEMPLATE = app.jinja_env.get_template('home.html')
+MODEL_TEMPLATE = app.jinja_env.get_template('model.html')
+
+
+@app.route('/')
+def home():
+    """Frontend homepage showing available models"""
+    models, etag = get_models_snapshot()
     
-    return render_template_string(html_template, model_cards=model_cards, model_count=len(models))
+    return cached_page(etag, lambda: HOME_TEMPLATE.render(models=models, model_count=len(models)))
 
 
 @app.route('/model/<path:model_id>')
@@ -186,7 +427,7 @@ def model_detail(model_id):
     """Show detailed information and API usage instructions for a specific model"""
     # Decode the URL-encoded model ID
     decoded_model_id = unquote(model_id)
-    models = get_models()
+    models, models_etag = get_models_snapshot()
     
     # Debug: Print available models and the requested model ID
     import sys
@@ -204,167 +445,25 @@ def model_detail(model_id):
         <a href='/'>← Back to Models</a>
         """, 404
     
-    provider_name = getattr(model, 'provider_name', model.get('owned_by', 'unknown'))
-    
-    html_template = """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>InferLine API - {{ model.id }}</title>
-        <style>
-            body {
-                font-family: Arial, sans-serif;
-                max-width: 1000px;
-                margin: 0 auto;
-                padding: 20px;
-                background-color: #f5f5f5;
-            }
-            .header {
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                color: white;
-                padding: 30px;
-                border-radius: 10px;
-                text-align: center;
-                margin-bottom: 30px;
-            }
-            .back-link {
-                display: inline-block;
-                color: white;
-                text-decoration: none;
-                margin-bottom: 10px;
-                opacity: 0.9;
-            }
-            .back-link:hover {
-                opacity: 1;
-            }
-            .model-info {
-                background: white;
-                padding: 25px;
-                border-radius: 10px;
-                margin-bottom: 25px;
-                box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-            }
-            .code-block {
-                background: #2d3748;
-                color: #e2e8f0;
-                padding: 20px;
-                border-radius: 8px;
-                overflow-x: auto;
-                margin: 15px 0;
-                font-family: 'Courier New', monospace;
-            }
-            .section {
-                background: white;
-                padding: 25px;
-                border-radius: 10px;
-                margin-bottom: 25px;
-                box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-            }
-            .section h3 {
-                margin: 0 0 20px 0;
-                color: #333;
-                border-bottom: 2px solid #667eea;
-                padding-bottom: 10px;
-            }
-            .param-table {
-                width: 100%;
-                border-collapse: collapse;
-                margin-top: 15px;
-            }
-            .param-table th, .param-table td {
-                border: 1px solid #ddd;
-                padding: 12px;
-                text-align: left;
-            }
-            .param-table th {
-                background-color: #f8f9fa;
-                font-weight: bold;
-            }
-            .highlight {
-                background-color: #fff3cd;
-                padding: 15px;
-                border-radius: 5px;
-                border-left: 4px solid #ffc107;
-                margin: 15px 0;
-            }
-        </style>
-    </head>
-    <body>
-        <div class="header">
-            <a href="/" class="back-link">← Back to Models</a>
-            <h1>{{ decoded_model_id }}</h1>
-            <p>API Usage Instructions</p>
-        </div>
-        
-        <div class="model-info">
-            <h3>Model Information</h3>
-            <p><strong>Model ID:</strong> {{ decoded_model_id }}</p>
-            <p><strong>Provider:</strong> {{ provider_name }}</p>
-            <p><strong>Description:</strong> {{ model.description }}</p>
-            <p><strong>Context Length:</strong> {{ "{:,}".format(model.context_length) }} tokens</p>
-            <p><strong>Max Output Length:</strong> {{ "{:,}".format(model.max_output_length) }} tokens</p>
-            <p><strong>Created:</strong> {{ created_date }}</p>
-        </div>
-        
-        <div class="section">
-            <h3>cURL Example</h3>
-            <div class="code-block">curl -X POST "{{ base_url }}/api/completions" -H "Content-Type: application/json" -d '{ "model": "{{ decoded_model_id }}", "prompt": "Hello, how are you?" }'</div>
-        </div>
-        
-        <div class="section">
-            <h3>Request Parameters</h3>
-            <table class="param-table">
-                <tr>
-                    <th>Parameter</th>
-                    <th>Type</th>
-                    <th>Required</th>
-                    <th>Description</th>
-                </tr>
-                <tr>
-                    <td>model</td>
-                    <td>string</td>
-                    <td>Yes</td>
-                    <td>The model ID to use for completion</td>
-                </tr>
-                <tr>
-                    <td>prompt</td>
-                    <td>string</td>
-                    <td>Yes</td>
-                    <td>The text prompt to complete</td>
-                </tr>
-                <tr>
-                    <td>max_tokens</td>
-                    <td>integer</td>
-                    <td>No</td>
-                    <td>Maximum number of tokens to generate (optional)</td>
-                </tr>
-                <tr>
-                    <td>temperature</td>
-                    <td>float</td>
-                    <td>No</td>
-                    <td>Sampling temperature (optional, 0.0-2.0)</td>
-                </tr>
-            </table>
-        </div>
-        
-        <div class="highlight">
-            <strong>Note:</strong> This is a queued inference system. Requests may take some time to process depending on provider availability and queue status. Check <a href="/api/queue/stats" target="_blank">queue statistics</a> for current load.
-        </div>
-    </body>
-    </html>
-    """
-    
-    created_date = datetime.fromtimestamp(model.get('created', 0)).strftime('%Y-%m-%d %H:%M:%S')
+    def render():
+        # Every field is formatted here so the template only substitutes strings
+        ctx = {
+            'decoded_model_id': decoded_model_id,
+            'provider_name': model.get('owned_by', 'unknown'),
+            'description': model.get('description'),
+            'context_length': format_token_count(model.get('context_length')),
+            'max_output_length': format_token_count(model.get('max_output_length')),
+            'created_date': datetime.fromtimestamp(model.get('created', 0)).strftime('%Y-%m-%d %H:%M:%S'),
+            'base_url': FRONTEND_BASE_URL,
+        }
+        return MODEL_TEMPLATE.render(**ctx)
     
-    return render_template_string(
-        html_template,
-        model=model,
-        decoded_model_id=decoded_model_id,
-        provider_name=provider_name,
-        base_url=FRONTEND_BASE_URL,
-        created_date=created_date
-    )
+    etag = None
+    if models_etag is not None:
+        etag = hashlib.md5(f"{models_etag}:{decoded_model_id}".encode()).hexdigest()
+    return cached_page(etag, render)
 
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
+    # Development server only; production runs under gunicorn (see docker/frontend.Dockerfile)
+    app.run(host='0.0.0.0', port=5000, debug=os.getenv('INFERLINE_DEV') == '1')
\ No newline at end of file
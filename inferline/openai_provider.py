@@ -1,19 +1,31 @@
 import asyncio
 import logging
 import time
-from typing import Optional, Dict, List
+from typing import Any, FrozenSet, Optional, Dict, List, Set, Union
 import aiohttp
+import orjson
 import os
+from pydantic import TypeAdapter
 
 from inferline.schemas.openai import (
     QueuedInferenceRequest,
-    InferenceResult,
     ProviderCapabilities,
     QueueRequestWithCapabilities
 )
 
 logger = logging.getLogger(__name__)
 
+# The server rejects /queue/next?max= above this (server.MAX_DEQUEUE_BATCH)
+MAX_DEQUEUE_BATCH = 64
+
+# Decodes a /queue/next body straight from bytes; older servers return a single object
+_queue_next_adapter = TypeAdapter(Union[List[QueuedInferenceRequest], QueuedInferenceRequest])
+
+
+def _json_dumps(obj: Any) -> str:
+    """orjson-backed serializer for aiohttp; request payloads may carry int keys (logit_bias)"""
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
 
 class OpenAIProvider:
     """Service that wraps OpenAI endpoint and processes inferline requests"""
@@ -25,38 +37,92 @@ class OpenAIProvider:
         inferline_base_url: str = "http://localhost:8000",
         poll_interval: float = 1.0,
         model_refresh_interval: float = 60.0,
-        provider_id: Optional[str] = None
+        provider_id: Optional[str] = None,
+        long_poll_timeout: float = 30.0,
+        max_inflight: int = 8,
+        max_batch_size: int = 8,
+        num_workers: int = 1
     ):
         self.openai_base_url = openai_base_url.rstrip('/')
         self.openai_api_key = openai_api_key or os.getenv('OPENAI_API_KEY', '')
         self.inferline_base_url = inferline_base_url.rstrip('/')
         self.poll_interval = poll_interval
         self.model_refresh_interval = model_refresh_interval
+        self.long_poll_timeout = long_poll_timeout
+        self.max_inflight = max_inflight
+        if max_batch_size > MAX_DEQUEUE_BATCH:
+            logger.warning("max_batch_size %s exceeds the server limit, using %s", max_batch_size, MAX_DEQUEUE_BATCH)
+        self.max_batch_size = max(1, min(max_batch_size, MAX_DEQUEUE_BATCH))
+        self.num_workers = num_workers
         self.provider_id = provider_id or os.getenv('PROVIDER_ID', 'openai-provider')
         
+        # Endpoint URLs, built once
+        self._url_models = f"{self.openai_base_url}/v1/models"
+        self._url_completions = f"{self.openai_base_url}/v1/completions"
+        self._url_chat_completions = f"{self.openai_base_url}/v1/chat/completions"
+        self._url_queue_next = f"{self.inferline_base_url}/queue/next"
+        self._url_queue_result = f"{self.inferline_base_url}/queue/result"
+        
+        # Headers sent with every OpenAI call, built once
+        self._openai_headers = {'Content-Type': 'application/json'}
+        if self.openai_api_key:
+            self._openai_headers['Authorization'] = f'Bearer {self.openai_api_key}'
+        
         # Log the provider ID for debugging
         logger.info(f"Provider ID set to: {self.provider_id}")
         
-        self.available_models: List[str] = []
+        self.available_models: FrozenSet[str] = frozenset()
+        self._poll_payload: Dict = self._build_poll_payload()
         self.last_model_refresh = 0
         self.session: Optional[aiohttp.ClientSession] = None
         self.running = False
         
+        # Bounds the number of requests forwarded to OpenAI concurrently
+        self._inflight: Optional[asyncio.Semaphore] = None
+        self._tasks: Set[asyncio.Task] = set()
+        
     async def start(self):
         """Start the provider service"""
-        self.session = aiohttp.ClientSession()
+        # Each in-flight request can hold one OpenAI and one inferline connection
+        # (streaming), plus the long-poll and model refresh; both base URLs may
+        # point at the same host, so size the per-host limit for the sum.
+        connection_limit = 2 * self.max_inflight + 2
+        connector = aiohttp.TCPConnector(
+            limit=connection_limit,
+            limit_per_host=connection_limit,
+            ttl_dns_cache=300,
+            keepalive_timeout=75
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=300, sock_connect=10),
+            json_serialize=_json_dumps
+        )
+        self._inflight = asyncio.Semaphore(self.max_inflight)
         self.running = True
         logger.info("OpenAI Provider started")
         
-        # Start background tasks
-        await asyncio.gather(
-            self._model_refresh_loop(),
-            self._request_processing_loop()
+        # Advertise our models before the first poll so early requests are not missed
+        await self._refresh_models()
+        
+        # Start background tasks; if one fails, don't leave the other running
+        # Every worker polls independently; all of them share the in-flight limit
+        tasks = [asyncio.create_task(self._model_refresh_loop())]
+        tasks.extend(
+            asyncio.create_task(self._request_processing_loop())
+            for _ in range(self.num_workers)
         )
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
     
     async def stop(self):
         """Stop the provider service"""
         self.running = False
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
         if self.session:
             await self.session.close()
         logger.info("OpenAI Provider stopped")
@@ -64,31 +130,29 @@ class OpenAIProvider:
     async def _model_refresh_loop(self):
         """Periodically refresh available models from OpenAI endpoint"""
         while self.running:
+            await asyncio.sleep(self.model_refresh_interval)
             try:
                 await self._refresh_models()
-                await asyncio.sleep(self.model_refresh_interval)
             except Exception as e:
                 logger.error(f"Error refreshing models: {e}")
-                await asyncio.sleep(self.model_refresh_interval)
     
     async def _refresh_models(self):
         """Fetch available models from OpenAI endpoint"""
         try:
-            headers = {}
-            if self.openai_api_key:
-                headers['Authorization'] = f'Bearer {self.openai_api_key}'
-            
             async with self.session.get(
-                f"{self.openai_base_url}/v1/models",
-                headers=headers
+                self._url_models,
+                headers=self._openai_headers
             ) as response:
                 if response.status == 200:
-                    data = await response.json()
+                    data = orjson.loads(await response.read())
                     # Extract model IDs from OpenAI format
                     models = data.get('data', [])
-                    self.available_models = [model['id'].removeprefix('/models/') for model in models]
+                    available_models = frozenset(model['id'].removeprefix('/models/') for model in models)
                     self.last_model_refresh = time.time()
-                    logger.info(f"Refreshed models: {self.available_models}")
+                    if available_models != self.available_models:
+                        self.available_models = available_models
+                        self._poll_payload = self._build_poll_payload()
+                    logger.info(f"Refreshed models: {sorted(self.available_models)}")
                 else:
                     logger.warning(f"Failed to fetch models: HTTP {response.status}")
         except Exception as e:
@@ -96,154 +160,198 @@ class OpenAIProvider:
     
     
     async def _request_processing_loop(self):
-        """Main loop to poll for and process inference requests"""
+        """Main loop to poll for inference requests and dispatch them concurrently.
+
+        Slots in ``_inflight`` are taken before polling, so the provider only
+        pulls as many requests as it has capacity for; each slot is released
+        once its request has been processed.
+        """
         while self.running:
+            # Wait for one free slot, then claim any others that are free right now
+            await self._inflight.acquire()
+            slots = 1
+            while slots < self.max_batch_size and not self._inflight.locked():
+                await self._inflight.acquire()
+                slots += 1
+            
             try:
-                request = await self._get_next_request()
-                if request:
-                    await self._process_request(request)
-                else:
-                    await asyncio.sleep(self.poll_interval)
+                batch = await self._get_next_batch(slots)
             except Exception as e:
+                self._release_slots(slots)
                 logger.error(f"Error in request processing loop: {e}")
                 await asyncio.sleep(self.poll_interval)
-    
-    async def _get_next_request(self) -> Optional[QueuedInferenceRequest]:
-        """Get the next pending request from inferline queue that we can handle"""
-        try:
-            # Create provider capabilities
-            capabilities = ProviderCapabilities(
-                provider_id=self.provider_id,
-                supported_models=self.available_models,
-                request_types=["completion", "chat"]
-            )
+                continue
             
-            logger.info(f"Sending capabilities with provider_id: {self.provider_id}")
+            self._release_slots(slots - len(batch))
+            for request in batch:
+                task = asyncio.create_task(self._run_request(request))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
             
-            request_data = QueueRequestWithCapabilities(
-                provider_capabilities=capabilities,
-                provider_base_url=self.openai_base_url
-            )
-            
-            async with self.session.post(
-                f"{self.inferline_base_url}/queue/next",
-                json=request_data.model_dump()
-            ) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return QueuedInferenceRequest(**data)
-                elif response.status == 204:
-                    # No pending requests for this provider
-                    return None
-                else:
-                    logger.warning(f"Failed to get next request: HTTP {response.status}")
-                    return None
-        except Exception as e:
-            logger.error(f"Error getting next request: {e}")
-            return None
+            if not batch and self.long_poll_timeout <= 0:
+                # Server answered immediately with no work; wait before polling again
+                await asyncio.sleep(self.poll_interval)
+    
+    def _release_slots(self, count: int):
+        """Return unused in-flight slots to the semaphore"""
+        for _ in range(count):
+            self._inflight.release()
+    
+    async def _run_request(self, request: QueuedInferenceRequest):
+        """Process a request and free its in-flight slot"""
+        try:
+            await self._process_request(request)
+        finally:
+            self._inflight.release()
+    
+    def _build_poll_payload(self) -> Dict:
+        """Serialize our capabilities for /queue/next; rebuilt only when the model set changes"""
+        capabilities = ProviderCapabilities(
+            provider_id=self.provider_id,
+            supported_models=sorted(self.available_models),
+            request_types=["completion", "chat"]
+        )
+        
+        return QueueRequestWithCapabilities(
+            provider_capabilities=capabilities,
+            provider_base_url=self.openai_base_url
+        ).model_dump()
+    
+    async def _get_next_batch(self, max_n: int) -> List[QueuedInferenceRequest]:
+        """Get up to ``max_n`` pending requests from inferline queue that we can handle.
+
+        When long polling is enabled the server holds the connection until a
+        matching request arrives or ``long_poll_timeout`` expires. Errors are
+        raised so the processing loop backs off instead of re-polling at once.
+
+        The server marks a batch PROCESSING as soon as it answers, so if this
+        call fails after that (timeout, undecodable body) the whole batch is
+        lost until its clients time out. ``max_batch_size`` bounds that loss,
+        which is why it defaults to a small value.
+        """
+        logger.debug("Polling for up to %s requests as provider %s", max_n, self.provider_id)
+        
+        async with self.session.post(
+            self._url_queue_next,
+            json=self._poll_payload,
+            params={'wait': self.long_poll_timeout, 'max': max_n},
+            timeout=aiohttp.ClientTimeout(total=self.long_poll_timeout + 5)
+        ) as response:
+            if response.status == 200:
+                data = _queue_next_adapter.validate_json(await response.read())
+                # Older servers ignore ?max= and return a single object
+                if isinstance(data, QueuedInferenceRequest):
+                    data = [data]
+                return data
+            elif response.status == 204:
+                # No pending requests for this provider
+                return []
+            else:
+                raise Exception(f"Failed to get next request: HTTP {response.status}")
     
     async def _process_request(self, request: QueuedInferenceRequest):
         """Process an inference request by forwarding to OpenAI"""
         try:
-            model = request.request_data.get('model')
+            # Streaming responses are relayed to inferline chunk by chunk instead of buffered
+            stream = bool(request.request_data.get('stream'))
             
             # Process based on request type (no need to check model availability - server already filtered)
             if request.request_type == "completion":
+                if stream:
+                    await self._process_streaming_request(request, self._url_completions)
+                    return
                 result = await self._process_completion_request(request)
             elif request.request_type == "chat":
+                if stream:
+                    await self._process_streaming_request(request, self._url_chat_completions)
+                    return
                 result = await self._process_chat_completion_request(request)
             else:
-                await self._submit_error_result(
+                await self._submit(
                     request.request_id,
-                    f"Unsupported request type: {request.request_type}"
+                    error=f"Unsupported request type: {request.request_type}"
                 )
                 return
             
             # Submit successful result
-            await self._submit_result(request.request_id, result)
+            await self._submit(request.request_id, result_data=result)
             
         except Exception as e:
-            logger.error(f"Error processing request {request.request_id}: {e}")
-            await self._submit_error_result(request.request_id, str(e))
+            logger.error("Error processing request %s: %s", request.request_id, e)
+            await self._submit(request.request_id, error=str(e))
 
     async def _process_completion_request(self, request: QueuedInferenceRequest) -> Dict:
-        headers = {
-            'Content-Type': 'application/json'
-        }
-        if self.openai_api_key:
-            headers['Authorization'] = f'Bearer {self.openai_api_key}'
-
         async with self.session.post(
-            f"{self.openai_base_url}/v1/completions",
+            self._url_completions,
             json=request.request_data,
-            headers=headers
+            headers=self._openai_headers
         ) as response:
             if response.status == 200:
-                return await response.json()
+                return orjson.loads(await response.read())
             else:
                 error_text = await response.text()
                 raise Exception(f"OpenAI API error {response.status}: {error_text}")
 
     async def _process_chat_completion_request(self, request: QueuedInferenceRequest) -> Dict:
-        headers = {
-            'Content-Type': 'application/json'
-        }
-        if self.openai_api_key:
-            headers['Authorization'] = f'Bearer {self.openai_api_key}'
-
         async with self.session.post(
-            f"{self.openai_base_url}/v1/chat/completions",
+            self._url_chat_completions,
             json=request.request_data,
-            headers=headers
+            headers=self._openai_headers
         ) as response:
             if response.status == 200:
-                return await response.json()
+                return orjson.loads(await response.read())
             else:
                 error_text = await response.text()
                 raise Exception(f"OpenAI API error {response.status}: {error_text}")
-    
-    async def _submit_result(self, request_id: str, result_data: Dict):
-        """Submit successful result back to inferline"""
-        try:
-            result = InferenceResult(
-                request_id=request_id,
-                result_data=result_data,
-                usage=result_data.get('usage'),
-                error_message=None
-            )
-            
+
+    async def _process_streaming_request(self, request: QueuedInferenceRequest, url: str):
+        """Forward a streaming request to OpenAI and pipe the response body to inferline"""
+        async with self.session.post(
+            url,
+            json=request.request_data,
+            headers=self._openai_headers
+        ) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                raise Exception(f"OpenAI API error {response.status}: {error_text}")
+
+            # Upload the body as it arrives; aiohttp sends it with chunked transfer encoding
             async with self.session.post(
-                f"{self.inferline_base_url}/queue/result",
-                json=result.model_dump()
-            ) as response:
-                if response.status == 200:
-                    logger.info(f"Successfully submitted result for request {request_id}")
+                f"{self._url_queue_result}/stream/{request.request_id}",
+                data=response.content.iter_any()
+            ) as result_response:
+                if result_response.status == 200:
+                    logger.debug("Streamed result for request %s", request.request_id)
                 else:
-                    logger.error(f"Failed to submit result: HTTP {response.status}")
-        except Exception as e:
-            logger.error(f"Error submitting result for {request_id}: {e}")
+                    raise Exception(f"Failed to submit stream: HTTP {result_response.status}")
     
-    async def _submit_error_result(self, request_id: str, error_message: str):
-        """Submit error result back to inferline"""
+    async def _submit(
+        self,
+        request_id: str,
+        result_data: Optional[Dict] = None,
+        error: Optional[str] = None
+    ):
+        """Submit a successful result or an error back to inferline"""
+        # Plain dict in the InferenceResult shape; skips pydantic validation per result
+        result = {
+            'request_id': request_id,
+            'result_data': result_data if result_data is not None else {},
+            'usage': result_data.get('usage') if result_data is not None else None,
+            'error_message': error
+        }
+        kind = "error" if error is not None else "result"
+        
         try:
-            result = InferenceResult(
-                request_id=request_id,
-                result_data={},
-                usage=None,
-                error_message=error_message
-            )
-            
             async with self.session.post(
-                f"{self.inferline_base_url}/queue/result",
-                json=result.model_dump()
+                self._url_queue_result,
+                json=result
             ) as response:
                 if response.status == 200:
-                    logger.info(f"Successfully submitted error for request {request_id}")
+                    logger.debug("Submitted %s for request %s", kind, request_id)
                 else:
-                    logger.error(f"Failed to submit error: HTTP {response.status}")
+                    logger.error("Failed to submit %s for request %s: HTTP %s", kind, request_id, response.status)
         except Exception as e:
-            logger.error(f"Error submitting error for {request_id}: {e}")
-
+            logger.error("Error submitting %s for %s: %s", kind, request_id, e)
 
 async def main():
     """Main function to run the OpenAI provider service"""
@@ -256,6 +364,10 @@ async def main():
     poll_interval = float(os.getenv('POLL_INTERVAL', '1.0'))
     model_refresh_interval = float(os.getenv('MODEL_REFRESH_INTERVAL', '60.0'))
     provider_id = os.getenv('PROVIDER_ID', 'openai-provider')
+    long_poll_timeout = float(os.getenv('LONG_POLL_TIMEOUT', '30.0'))
+    max_inflight = int(os.getenv('MAX_INFLIGHT', '8'))
+    max_batch_size = int(os.getenv('MAX_BATCH_SIZE', '8'))
+    num_workers = int(os.getenv('PROVIDER_WORKERS', '1'))
     
     provider = OpenAIProvider(
         openai_base_url=openai_base_url,
@@ -263,7 +375,11 @@ async def main():
         inferline_base_url=inferline_base_url,
         poll_interval=poll_interval,
         model_refresh_interval=model_refresh_interval,
-        provider_id=provider_id
+        provider_id=provider_id,
+        long_poll_timeout=long_poll_timeout,
+        max_inflight=max_inflight,
+        max_batch_size=max_batch_size,
+        num_workers=num_workers
     )
     
     try:
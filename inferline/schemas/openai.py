@@ -1,17 +1,72 @@
-from pydantic import BaseModel, Field
-from typing import Any, List, Optional
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_validator
+from typing import Annotated, Any, Final, List, Optional, Tuple
+from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
+import itertools
+import time
 import uuid
 
 
-class Pricing(BaseModel):
-    prompt: float = Field(0.0, description="pricing per 1 token in USD")
-    completion: float = Field(0.0, description="pricing per 1 token in USD")
-    image: float = Field(0.0, description="pricing per 1 image")
-    request: float = Field(0.0, description="pricing per 1 request")
-    input_cache_reads: float = Field(0.0, description="pricing per 1 token")
-    input_cache_writes: float = Field(0.0, description="pricing per 1 token")
+__all__ = [
+    "Pricing",
+    "Model",
+    "ModelsResponse",
+    "ChatMessage",
+    "ChatCompletionRequest",
+    "ChatCompletionResponseChoice",
+    "ChatCompletionResponse",
+    "CompletionRequest",
+    "CompletionResponseChoice",
+    "CompletionResponse",
+    "InferenceStatus",
+    "QueuedInferenceRequest",
+    "InferenceResult",
+    "QueueStats",
+    "InferenceRequestResponse",
+    "ProviderModelRegistration",
+    "ProviderRegistrationResponse",
+    "ProviderCapabilities",
+    "QueueRequestWithCapabilities",
+]
+
+
+# Response ids are a per-process random prefix plus a counter: unique without
+# formatting the current time on every response.
+_ID_PREFIX = uuid.uuid4().hex[:8]
+_ID_COUNTER = itertools.count()
+
+
+def _cmpl_id() -> str:
+    return f"cmpl-{_ID_PREFIX}{next(_ID_COUNTER):x}"
+
+
+def _chatcmpl_id() -> str:
+    return f"chatcmpl-{_ID_PREFIX}{next(_ID_COUNTER):x}"
+
+
+def _now() -> int:
+    return int(time.time())
+
+
+# Plain frozen dataclass: constructing one runs no validation, while pydantic still
+# validates and documents it where it is nested in Model
+@dataclass(frozen=True)
+class Pricing:
+    prompt: Annotated[float, Field(description="pricing per 1 token in USD")] = 0.0
+    completion: Annotated[float, Field(description="pricing per 1 token in USD")] = 0.0
+    image: Annotated[float, Field(description="pricing per 1 image")] = 0.0
+    request: Annotated[float, Field(description="pricing per 1 request")] = 0.0
+    input_cache_reads: Annotated[float, Field(description="pricing per 1 token")] = 0.0
+    input_cache_writes: Annotated[float, Field(description="pricing per 1 token")] = 0.0
+
+
+# Shared defaults for Model. Tuples are immutable, so pydantic can hand them out
+# as-is; a list or model default is deep-copied for every instance.
+_DEFAULT_PRICING: Final = Pricing()
+_DEFAULT_MODALITIES: Final[Tuple[str, ...]] = ("text",)
+_DEFAULT_SAMPLING: Final[Tuple[str, ...]] = ("temperature", "top_p", "top_k", "repetition_penalty",
+                                           "frequency_penalty", "presence_penalty", "stop", "seed")
 
 
 class Model(BaseModel):
@@ -19,10 +74,10 @@ class Model(BaseModel):
     object: str = Field(..., description="Object type")
     created: int = Field(..., description="Timestamp of model creation")
 
-    input_modalities: List[str] = Field(["text"], description="Input modalities")
-    output_modalities: List[str] = Field(["text"], description="Output modalities")
+    input_modalities: Tuple[str, ...] = Field(_DEFAULT_MODALITIES, description="Input modalities")
+    output_modalities: Tuple[str, ...] = Field(_DEFAULT_MODALITIES, description="Output modalities")
     owned_by: str = Field(..., description="Owner of the model")
-    pricing: Pricing = Field(Pricing(), description="Pricing information")
+    pricing: Pricing = Field(default_factory=lambda: _DEFAULT_PRICING, description="Pricing information")
     description: Optional[str] = Field(None, description="Description of the model's capabilities")
     icon_url: Optional[str] = Field(None, description="URL to the model's icon image")
     instructions_url: Optional[str] = Field(None, description="URL to the model's usage instructions")
@@ -33,10 +88,12 @@ class Model(BaseModel):
     parameters: Optional[str] = Field(None, description="Number of parameters")
     quantization: Optional[str] = Field(None, description="Quantization type")
     provider_name: Optional[str] = Field(None, description="Name of the provider")
-    supported_sampling_parameters: Optional[List[str]] = Field(
-        ["temperature", "top_p", "top_k", "repetition_penalty", "frequency_penalty", "presence_penalty", "stop",
-         "seed"], description="List of supported sampling parameters")
-    supported_features: Optional[List[str]] = Field([], description="List of supported features")
+    supported_sampling_parameters: Optional[Tuple[str, ...]] = Field(
+        _DEFAULT_SAMPLING, description="List of supported sampling parameters")
+    supported_features: Optional[List[str]] = Field(default_factory=list, description="List of supported features")
+
+    # Model entries are built once and only ever read afterwards
+    model_config = ConfigDict(frozen=True)
 
 
 class ModelsResponse(BaseModel):
@@ -58,7 +115,7 @@ class ChatCompletionRequest(BaseModel):
     top_p: Optional[float] = Field(0.9, description="Alternative to sampling with temperature")
     top_k: Optional[int] = Field(40, description="Top-k sampling value (range: [1, Infinity)).")
     n: Optional[int] = Field(1, description="How many chat completion choices to generate")
-    stop: Optional[List[str]] = Field(None, description="Sequences where the API will stop generating further tokens")
+    stop: Any = Field(None, description="Sequences where the API will stop generating further tokens")
     presence_penalty: Optional[float] = Field(0.0,
                                               description="Positive values penalize new tokens based on their existing frequency")
     frequency_penalty: Optional[float] = Field(0.0,
@@ -69,13 +126,12 @@ class ChatCompletionRequest(BaseModel):
     seed: Optional[int] = Field(None, description="Seed for deterministic outputs.")
     min_p: Optional[float] = Field(0.0,
                                    description="Float that represents the minimum probability for a token to be considered, relative to the probability of the most likely token.")
-    logit_bias: Optional[dict[int, float]] = Field(None,
-                                                   description="If provided, the engine will construct a logits processor that applies these logit biases",
-                                                   examples=[None])
-    stream_options: Optional[dict[str, str]] = Field(None, description="Stream options")
+    logit_bias: Any = Field(None,
+                            description="If provided, the engine will construct a logits processor that applies these logit biases",
+                            examples=[None])
+    stream_options: Any = Field(None, description="Stream options")
 
-    class Config:
-        extra = "allow"
+    model_config = ConfigDict(extra="allow", defer_build=True)
 
 
 class ChatCompletionResponseChoice(BaseModel):
@@ -85,15 +141,14 @@ class ChatCompletionResponseChoice(BaseModel):
 
 
 class ChatCompletionResponse(BaseModel):
-    id: str = Field(default_factory=lambda: f"chatcmpl-{datetime.now().strftime('%Y%m%d%H%M%S')}")
+    id: str = Field(default_factory=_chatcmpl_id)
     object: str = "chat.completion"
-    created: int = Field(default_factory=lambda: int(datetime.now().timestamp()))
+    created: int = Field(default_factory=_now)
     model: str
     choices: List[ChatCompletionResponseChoice]
     usage: dict = Field(default_factory=dict)
 
-    class Config:
-        extra = "allow"
+    model_config = ConfigDict(extra="allow", defer_build=True)
 
 
 class CompletionRequest(BaseModel):
@@ -106,7 +161,7 @@ class CompletionRequest(BaseModel):
     n: Optional[int] = Field(1, description="How many completions to generate")
     stream: Optional[bool] = Field(False, description="If true, partial message deltas will be sent")
     echo: Optional[bool] = Field(False, description="Echo back the prompt in addition to the completion")
-    stop: Optional[List[str]] = Field(None, description="Sequences where the API will stop generating further tokens")
+    stop: Any = Field(None, description="Sequences where the API will stop generating further tokens")
     presence_penalty: Optional[float] = Field(0.0,
                                               description="Positive values penalize new tokens based on their existing frequency")
     frequency_penalty: Optional[float] = Field(0.0,
@@ -119,14 +174,13 @@ class CompletionRequest(BaseModel):
     seed: Optional[int] = Field(None, description="Seed for deterministic outputs.")
     min_p: Optional[float] = Field(0.0,
                                    description="Float that represents the minimum probability for a token to be considered, relative to the probability of the most likely token.")
-    logit_bias: Optional[dict[int, float]] = Field(None,
-                                                   description="If provided, the engine will construct a logits processor that applies these logit biases",
-                                                   examples=[None])
-    stream_options: Optional[dict[str, Any]] = Field(None, description="Stream options")
+    logit_bias: Any = Field(None,
+                            description="If provided, the engine will construct a logits processor that applies these logit biases",
+                            examples=[None])
+    stream_options: Any = Field(None, description="Stream options")
     ignore_eos: Optional[bool] = Field(False, description="If true, the end of string token will be ignored")
 
-    class Config:
-        extra = "allow"
+    model_config = ConfigDict(extra="allow", defer_build=True)
 
 
 class CompletionResponseChoice(BaseModel):
@@ -135,20 +189,18 @@ class CompletionResponseChoice(BaseModel):
     logprobs: Optional[dict]
     finish_reason: str
 
-    class Config:
-        extra = "allow"
+    model_config = ConfigDict(extra="allow", defer_build=True)
 
 
 class CompletionResponse(BaseModel):
-    id: str = Field(default_factory=lambda: f"cmpl-{datetime.now().strftime('%Y%m%d%H%M%S')}")
+    id: str = Field(default_factory=_cmpl_id)
     object: str = "text.completion"
-    created: int = Field(default_factory=lambda: int(datetime.now().timestamp()))
+    created: int = Field(default_factory=_now)
     model: str
     choices: List[CompletionResponseChoice]
     usage: dict = Field(default_factory=dict)
 
-    class Config:
-        extra = "allow"
+    model_config = ConfigDict(extra="allow", defer_build=True)
 
 
 class InferenceStatus(str, Enum):
@@ -158,16 +210,29 @@ class InferenceStatus(str, Enum):
     FAILED = "failed"
 
 
+_DATETIME_ADAPTER = TypeAdapter(datetime)
+
+
 class QueuedInferenceRequest(BaseModel):
     request_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     request_type: str = Field(..., description="Type of request (completion or chat)")
     request_data: dict = Field(..., description="Original request data")
+    request_model: Optional[str] = Field(None, description="Model requested, copied out of request_data for dispatch")
     status: InferenceStatus = Field(InferenceStatus.PENDING)
-    created_at: datetime = Field(default_factory=datetime.now)
-    started_at: Optional[datetime] = Field(None)
-    completed_at: Optional[datetime] = Field(None)
+    # Epoch seconds; cheaper to stamp and compare than datetime objects
+    created_at: float = Field(default_factory=time.time)
+    started_at: Optional[float] = Field(None)
+    completed_at: Optional[float] = Field(None)
     error_message: Optional[str] = Field(None)
 
+    @field_validator("created_at", "started_at", "completed_at", mode="before")
+    @classmethod
+    def _to_epoch_seconds(cls, value: Any) -> Any:
+        """Accept the ISO datetimes sent by servers that predate float timestamps"""
+        if isinstance(value, (str, datetime)):
+            return _DATETIME_ADAPTER.validate_python(value).timestamp()
+        return value
+
 
 class InferenceResult(BaseModel):
     request_id: str = Field(..., description="ID of the original request")
@@ -203,7 +268,7 @@ class ProviderRegistrationResponse(BaseModel):
 class ProviderCapabilities(BaseModel):
     provider_id: str = Field(..., description="Unique identifier for the provider")
     supported_models: List[str] = Field(..., description="List of model IDs this provider can handle")
-    request_types: List[str] = Field(["completion"], description="Types of requests this provider supports")
+    request_types: Tuple[str, ...] = Field(("completion",), description="Types of requests this provider supports")
 
 
 class QueueRequestWithCapabilities(BaseModel):
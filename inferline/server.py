@@ -1,9 +1,18 @@
+import os
+import sys
 import time
 import asyncio
-from typing import List, Union, Dict
-from fastapi import FastAPI, HTTPException
+import heapq
+from contextlib import asynccontextmanager, suppress
+from itertools import islice
+from typing import AsyncIterator, Final, FrozenSet, List, Optional, Set, Tuple, Union, Dict
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from pydantic import TypeAdapter, ValidationError
+from starlette.requests import ClientDisconnect
+import orjson
 import uvicorn
-from datetime import datetime
 
 from inferline.schemas.openai import (
     Model,
@@ -22,16 +31,72 @@ from inferline.schemas.openai import (
 )
 
 
+PROVIDER_SWEEP_INTERVAL: Final = 2.0  # Seconds between background sweeps for inactive providers
+RESULT_TTL: Final = 600.0  # Seconds a finished request and its result are kept for retrieval
+COMPLETION_TIMEOUT: Final = 300.0  # Seconds a client waits for its completion before giving up
+HEALTH_CLOCK_INTERVAL: Final = 1.0  # Resolution of the /health timestamp
+
+
+async def background_sweep():
+    """Periodically drop silent providers and expired results, off the request path"""
+    while True:
+        await asyncio.sleep(PROVIDER_SWEEP_INTERVAL)
+        cleanup_inactive_models()
+        evict_expired_results()
+
+
+async def health_clock():
+    """Advance the /health timestamp so probes never read the clock themselves"""
+    global health_timestamp
+    while True:
+        await asyncio.sleep(HEALTH_CLOCK_INTERVAL)
+        health_timestamp = int(time.time())
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    tasks = [asyncio.create_task(background_sweep()), asyncio.create_task(health_clock())]
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with suppress(asyncio.CancelledError):
+                await task
+
+
 app = FastAPI(
     title="InferLine API",
     description="OpenAI-compatible API server for LLM inference routing",
-    version="0.1.0"
+    version="0.1.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # In-memory storage for queue and results
 inference_queue: Dict[str, QueuedInferenceRequest] = {}
+
+# Requests still waiting for a provider, indexed by (model, request type); each
+# bucket keeps arrival order (dicts keep insertion order)
+pending_by_key: Dict[Tuple[str, str], Dict[str, QueuedInferenceRequest]] = {}
+
+# Number of requests in inference_queue per status; only enqueue_request,
+# set_status and drop_request touch it so it cannot drift
+status_counts: Dict[InferenceStatus, int] = dict.fromkeys(InferenceStatus, 0)
 results_storage: Dict[str, Union[CompletionResponse, dict]] = {}
 
+# (completed_at, request_id) of finished requests, oldest first, so expiry never scans
+finished_requests: List[Tuple[float, str]] = []
+
+# Chunks forwarded by providers for streaming requests; None marks the end of a stream.
+# Each queue is bounded, so a slow client pauses the provider upload instead of
+# the server buffering the whole completion
+stream_buffers: Dict[str, "asyncio.Queue[Optional[bytes]]"] = {}
+
+# Set when a non-streaming request completes or fails; its /completions call waits on it
+completion_events: Dict[str, asyncio.Event] = {}
+
 # Provider-registered models tracking (deprecated - kept for backward compatibility)
 provider_models: Dict[str, Dict[str, Model]] = {}  # provider_id -> {model_id -> Model}
 
@@ -40,15 +105,83 @@ available_models: Dict[str, Model] = {}
 
 # Active provider capabilities tracking
 active_providers: Dict[str, ProviderCapabilities] = {}  # provider_id -> capabilities
-provider_last_seen: Dict[str, float] = {}  # provider_id -> timestamp
+provider_last_seen: Dict[str, float] = {}  # provider_id -> time.monotonic() of last poll
+
+# provider_id -> (model, request type) pairs it serves; rebuilt only when its capabilities change
+provider_dispatch_keys: Dict[str, FrozenSet[Tuple[str, str]]] = {}
+
+# Union of supported_models across active_providers; rebuilt only when that changes
+active_model_ids: FrozenSet[str] = frozenset()
+
+# Keys of available_models that no active provider serves; the next sweep drops them
+unserved_models: Set[str] = set()
+
+# Long-polling providers park an event under each dispatch key they serve; a new
+# request only wakes the providers that can actually take it
+dispatch_waiters: Dict[Tuple[str, str], Set[asyncio.Event]] = {}
+MAX_LONG_POLL_WAIT: Final = 60.0  # Upper bound for the /queue/next ?wait= parameter
+LONG_POLL_HEARTBEAT: Final = 5.0  # Refresh provider_last_seen at least this often while waiting
+# Upper bound for the /queue/next ?max= parameter. A provider that fails after the
+# server answered strands the whole batch in PROCESSING until the clients time out,
+# so providers should ask for far fewer (OpenAIProvider defaults to 8)
+MAX_DEQUEUE_BATCH: Final = 64
+STREAM_BUFFER_CHUNKS: Final = 64  # Chunks held per streaming request before the provider upload waits
+
+queued_requests_adapter = TypeAdapter(List[QueuedInferenceRequest])
+models_response_adapter = TypeAdapter(ModelsResponse)
+
+# Serialized /models body; reset to None whenever any model source changes
+models_response_cache: Optional[bytes] = None
+
+# Serialized /health body and the (timestamp, counters) it was built from; the
+# timestamp is advanced by health_clock once per second
+health_timestamp: int = int(time.time())
+health_response_key: Optional[tuple] = None
+health_response_cache: bytes = b""
+
+
+def invalidate_models_cache():
+    """Drop the cached /models body so the next request rebuilds it"""
+    global models_response_cache
+    models_response_cache = None
+
+
+def refresh_active_model_ids():
+    """Recompute the set of models served by active providers"""
+    global active_model_ids
+    active_model_ids = frozenset(
+        model_id for capabilities in active_providers.values() for model_id in capabilities.supported_models
+    )
+    unserved_models.clear()
+    unserved_models.update(model_id for model_id in available_models if model_id not in active_model_ids)
+
+
+def track_provider(capabilities: ProviderCapabilities):
+    """Record that a provider is alive and what it currently serves"""
+    provider_id = capabilities.provider_id
+    previous = active_providers.get(provider_id)
+    active_providers[provider_id] = capabilities
+    provider_last_seen[provider_id] = time.monotonic()
+    models_changed = previous is None or previous.supported_models != capabilities.supported_models
+    if models_changed or previous.request_types != capabilities.request_types:
+        provider_dispatch_keys[provider_id] = frozenset(
+            (model_id, request_type)
+            for model_id in capabilities.supported_models
+            for request_type in capabilities.request_types
+        )
+    if models_changed:
+        refresh_active_model_ids()
+        invalidate_models_cache()
 
 
 def register_model_from_request(model_id: str):
     """Register a model as available when it's requested by a provider"""
     if model_id not in available_models:
+        # Intern the id once; it is kept as a dict key and compared on every later lookup
+        model_id = sys.intern(model_id)
         # Create a basic model entry for the requested model
         # In a real implementation, this could fetch model details from a registry
-        available_models[model_id] = Model(
+        available_models[model_id] = Model.model_construct(
             id=model_id,
             object="model",
             created=int(time.time()),
@@ -57,10 +190,13 @@ def register_model_from_request(model_id: str):
             context_length=4096,  # Default values - could be configured
             max_output_length=4096
         )
+        if model_id not in active_model_ids:
+            unserved_models.add(model_id)
+        invalidate_models_cache()
 
 def cleanup_inactive_models():
     """Remove models from providers that are no longer active"""
-    current_time = time.time()
+    current_time = time.monotonic()
     
     # Clean up inactive providers (older than 10 seconds)
     inactive_providers = [
@@ -72,63 +208,67 @@ def cleanup_inactive_models():
     for provider_id in inactive_providers:
         active_providers.pop(provider_id, None)
         provider_last_seen.pop(provider_id, None)
+        provider_dispatch_keys.pop(provider_id, None)
         print(f"Cleaned up inactive provider: {provider_id}")
     
-    # Clean up models that are no longer supported by any active provider
-    active_model_ids = set()
-    for capabilities in active_providers.values():
-        active_model_ids.update(capabilities.supported_models)
+    if inactive_providers:
+        refresh_active_model_ids()
     
-    # Remove models that are no longer supported by any active provider
-    models_to_remove = [
-        model_id for model_id in available_models.keys() 
-        if model_id not in active_model_ids
-    ]
+    # Remove models that are no longer supported by any active provider; the
+    # index is kept up to date on every change, so no scan of available_models
+    models_to_remove = list(unserved_models)
+    unserved_models.clear()
     
     for model_id in models_to_remove:
         del available_models[model_id]
         print(f"Cleaned up inactive model: {model_id}")
     
     if inactive_providers or models_to_remove:
+        invalidate_models_cache()
         print(f"Cleanup complete. Active providers: {len(active_providers)}, Available models: {len(available_models)}")
 
 
-@app.get("/models", response_model=ModelsResponse)
+def build_models_response() -> ModelsResponse:
+    """Merge models from active providers, legacy registrations and requests"""
+    created = int(time.time())
+    
+    # Models from active providers; iterate in reverse so the first provider listing a model wins
+    active_models = {
+        model_id: Model.model_construct(
+            id=model_id,
+            object="model",
+            created=created,
+            owned_by=provider_id,
+            description=f"Model served by provider: {provider_id}",
+            provider_name=provider_id,
+            context_length=4096,  # Default values
+            max_output_length=4096
+        )
+        for provider_id, capabilities in reversed(active_providers.items())
+        for model_id in capabilities.supported_models
+    }
+    
+    # Models from legacy registered providers (backward compatibility), first provider wins
+    legacy_models = {}
+    for models in reversed(provider_models.values()):
+        legacy_models.update(models)
+    
+    # Later sources win: active providers over legacy registrations over request-registered models
+    all_models = {**available_models, **legacy_models, **active_models}
+    
+    # Every entry is already a Model; skip re-validating the list
+    return ModelsResponse.model_construct(data=list(all_models.values()))
+
+
+@app.get("/models", responses={200: {"model": ModelsResponse}})
 async def list_models():
     """List all available models from active providers"""
-    # Clean up inactive providers and models
-    cleanup_inactive_models()
-    
-    all_models = {}
-    
-    # Add models from active providers
-    for provider_id, capabilities in active_providers.items():
-        for model_id in capabilities.supported_models:
-            if model_id not in all_models:
-                # Create a basic model entry for each supported model
-                all_models[model_id] = Model(
-                    id=model_id,
-                    object="model",
-                    created=int(time.time()),
-                    owned_by=provider_id,
-                    description=f"Model served by provider: {provider_id}",
-                    provider_name=provider_id,
-                    context_length=4096,  # Default values
-                    max_output_length=4096
-                )
-    
-    # Add models from legacy registered providers (backward compatibility)
-    for provider_id, models in provider_models.items():
-        for model_id, model in models.items():
-            if model_id not in all_models:
-                all_models[model_id] = model
-    
-    # Also include dynamically registered models from requests
-    for model_id, model in available_models.items():
-        if model_id not in all_models:
-            all_models[model_id] = model
-    
-    return ModelsResponse(data=list(all_models.values()))
+    global models_response_cache
+    
+    if models_response_cache is None:
+        models_response_cache = models_response_adapter.dump_json(build_models_response())
+    
+    return Response(content=models_response_cache, media_type="application/json")
 
 
 @app.post("/providers/register", response_model=ProviderRegistrationResponse)
@@ -141,6 +281,7 @@ async def register_provider_models(registration: ProviderModelRegistration):
     provider_models[provider_id] = {}
     for model in models:
         provider_models[provider_id][model.id] = model
+    invalidate_models_cache()
     
     return ProviderRegistrationResponse(
         success=True,
@@ -149,84 +290,273 @@ async def register_provider_models(registration: ProviderModelRegistration):
     )
 
 
-@app.post("/completions", response_model=CompletionResponse)
-async def create_completion(request: CompletionRequest):
+@app.post("/completions", responses={200: {"model": CompletionResponse}})
+async def create_completion(http_request: Request):
     """Create a text completion (synchronous with queue processing)"""
+    # Validate the raw body in one pass instead of json.loads + model validation
+    try:
+        request = CompletionRequest.model_validate_json(await http_request.body())
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)]
+        )
+    
     # Register the requested model as available
     register_model_from_request(request.model)
     
-    # Create queued request
-    queued_request = QueuedInferenceRequest(
+    # Create queued request; the payload was already validated as CompletionRequest
+    queued_request = QueuedInferenceRequest.model_construct(
         request_type="completion",
-        request_data=request.dict()
+        request_data=request.model_dump(),
+        request_model=request.model
     )
     
-    # Store in queue
-    inference_queue[queued_request.request_id] = queued_request
+    # Store in queue and wake up long-polling providers
+    request_id = queued_request.request_id
+    stream = request.stream
+    if stream:
+        stream_buffers[request_id] = asyncio.Queue(maxsize=STREAM_BUFFER_CHUNKS)
+    else:
+        done = completion_events[request_id] = asyncio.Event()
+    enqueue_request(queued_request)
     
     # Wait for completion with timeout
-    timeout = 300  # 5 minutes timeout
-    start_time = time.time()
-    
-    while time.time() - start_time < timeout:
-        queued_request = inference_queue[queued_request.request_id]
-        
-        if queued_request.status == InferenceStatus.COMPLETED:
-            if queued_request.request_id in results_storage:
-                result = results_storage[queued_request.request_id]
-                del inference_queue[queued_request.request_id]
-                del results_storage[queued_request.request_id]
-                return result
-            else:
-                raise HTTPException(status_code=500, detail="Result not found")
-        elif queued_request.status == InferenceStatus.FAILED:
-            error_msg = queued_request.error_message or "Unknown error"
-            del inference_queue[queued_request.request_id]
-            raise HTTPException(status_code=500, detail=f"Processing failed: {error_msg}")
-        
-        # Wait briefly before checking again
-        await asyncio.sleep(0.1)
-    
-    # Timeout occurred
-    raise HTTPException(status_code=408, detail="Request timeout - processing took too long")
+    timeout = COMPLETION_TIMEOUT
+    
+    if stream:
+        return RelayResponse(request_id, timeout)
+    
+    try:
+        await asyncio.wait_for(done.wait(), timeout=timeout)
+    except asyncio.TimeoutError:
+        # Nobody is left to collect this request; do not hand it to a provider later
+        drop_request(request_id)
+        results_storage.pop(request_id, None)
+        raise HTTPException(status_code=408, detail="Request timeout - processing took too long")
+    finally:
+        completion_events.pop(request_id, None)
+    
+    if queued_request.status == InferenceStatus.FAILED:
+        error_msg = queued_request.error_message or "Unknown error"
+        drop_request(request_id)
+        raise HTTPException(status_code=500, detail=f"Processing failed: {error_msg}")
+    
+    drop_request(request_id)
+    if request_id not in results_storage:
+        raise HTTPException(status_code=500, detail="Result not found")
+    # Relay the provider's JSON as-is instead of re-validating it
+    return ORJSONResponse(content=results_storage.pop(request_id))
+
+
+def openapi_with_completion_body() -> dict:
+    """OpenAPI schema with the /completions request body filled in.
+
+    create_completion reads the raw body, so FastAPI cannot document it. The
+    schema is added here on first use rather than at import, which would build
+    CompletionRequest and undo its deferred build.
+    """
+    if app.openapi_schema is None:
+        schema = FastAPI.openapi(app)
+        schema["paths"]["/completions"]["post"]["requestBody"] = {
+            "content": {"application/json": {"schema": CompletionRequest.model_json_schema()}},
+            "required": True
+        }
+    return app.openapi_schema
 
 
-@app.post("/queue/next", response_model=QueuedInferenceRequest)
-async def get_next_inference_request(provider_info: QueueRequestWithCapabilities):
-    """Get the next pending inference request that this provider can handle"""
+app.openapi = openapi_with_completion_body
+
+
+async def stream_result_chunks(request_id: str, timeout: float) -> AsyncIterator[bytes]:
+    """Relay chunks forwarded by the provider to the client until the stream ends"""
+    chunks = stream_buffers[request_id]
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    
+    while True:
+        try:
+            chunk = await asyncio.wait_for(chunks.get(), timeout=max(deadline - loop.time(), 0))
+        except asyncio.TimeoutError:
+            yield _sse_error("Request timeout - processing took too long")
+            return
+        if chunk is None:
+            break
+        yield chunk
+    
+    queued_request = inference_queue.get(request_id)
+    if queued_request is not None and queued_request.status == InferenceStatus.FAILED:
+        yield _sse_error(f"Processing failed: {queued_request.error_message or 'Unknown error'}")
+
+
+def release_stream(request_id: str):
+    """Forget a streaming request once its response is over, however it ended"""
+    chunks = stream_buffers.pop(request_id, None)
+    if chunks is not None:
+        # Free what the client never read; this also wakes a provider upload
+        # waiting for room, which then sees the buffer is gone and stops
+        while not chunks.empty():
+            chunks.get_nowait()
+    drop_request(request_id)
+
+
+class RelayResponse(StreamingResponse):
+    """SSE response relaying a provider's stream to the client.
+
+    Cleanup lives here rather than in the generator: if the client is gone
+    before the first send, the generator never starts and its ``finally``
+    would never run.
+    """
+
+    def __init__(self, request_id: str, timeout: float):
+        super().__init__(stream_result_chunks(request_id, timeout), media_type="text/event-stream")
+        self.request_id = request_id
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            release_stream(self.request_id)
+
+
+_SSE_ERROR_TEMPLATE = b'data: {"error":%b}\n\n'
+
+
+def _sse_error(message: str) -> bytes:
+    """Format an error message as a server-sent event"""
+    # Only the message needs JSON escaping; the rest of the event is fixed
+    return _SSE_ERROR_TEMPLATE % orjson.dumps(message)
+
+
+def pending_key(request: QueuedInferenceRequest) -> Tuple[str, str]:
+    """Dispatch key a request is indexed under while it waits for a provider"""
+    return request.request_model, request.request_type
+
+
+def add_pending(request: QueuedInferenceRequest):
+    """Index a request and wake the long-polling providers that can serve it"""
+    key = pending_key(request)
+    pending_by_key.setdefault(key, {})[request.request_id] = request
+    for waiter in dispatch_waiters.get(key, ()):
+        waiter.set()
+
+
+def remove_pending(request: QueuedInferenceRequest):
+    """Drop a request from the pending index, if it is still there"""
+    key = pending_key(request)
+    bucket = pending_by_key.get(key)
+    if bucket is not None and bucket.pop(request.request_id, None) is not None and not bucket:
+        del pending_by_key[key]
+
+
+def evict_expired_results():
+    """Forget finished requests nobody collected within RESULT_TTL"""
+    cutoff = time.time() - RESULT_TTL
+    while finished_requests and finished_requests[0][0] < cutoff:
+        _, request_id = heapq.heappop(finished_requests)
+        # Entries whose client already collected them are gone; popping again is a no-op
+        results_storage.pop(request_id, None)
+        stream_buffers.pop(request_id, None)
+        drop_request(request_id)
+
+
+def enqueue_request(request: QueuedInferenceRequest):
+    """Add a new request to the queue and make it visible to providers"""
+    inference_queue[request.request_id] = request
+    status_counts[request.status] += 1
+    add_pending(request)
+
+
+def set_status(request: QueuedInferenceRequest, status: InferenceStatus):
+    """Move a queued request to ``status``, keeping status_counts in step"""
+    # A streaming client may have already dropped the request; it is no longer counted then
+    if inference_queue.get(request.request_id) is request:
+        status_counts[request.status] -= 1
+        status_counts[status] += 1
+    request.status = status
+
+
+def drop_request(request_id: str) -> Optional[QueuedInferenceRequest]:
+    """Remove a request from the queue and every index that references it"""
+    request = inference_queue.pop(request_id, None)
+    if request is not None:
+        status_counts[request.status] -= 1
+        remove_pending(request)
+    return request
+
+
+def find_next_requests(dispatch_keys: FrozenSet[Tuple[str, str]], limit: int = 1) -> List[QueuedInferenceRequest]:
+    """Find up to ``limit`` oldest pending requests under any of the provider's dispatch keys"""
+    # Only the buckets this provider can serve are touched; each is already oldest-first
+    candidates = []
+    for key in dispatch_keys:
+        bucket = pending_by_key.get(key)
+        if bucket:
+            candidates.extend(islice(bucket.values(), limit))
+    return heapq.nsmallest(limit, candidates, key=lambda x: x.created_at)
+
+
+@app.post(
+    "/queue/next",
+    responses={200: {"model": Union[QueuedInferenceRequest, List[QueuedInferenceRequest]]}}
+)
+async def get_next_inference_request(
+    provider_info: QueueRequestWithCapabilities,
+    wait: float = 0,
+    max_requests: Optional[int] = Query(None, alias="max", ge=1, le=MAX_DEQUEUE_BATCH)
+):
+    """Get the next pending inference request(s) that this provider can handle.
+
+    With ``wait`` > 0 the call long-polls: it holds the connection for up to
+    ``wait`` seconds until a matching request arrives instead of returning 204.
+    When ``max`` is given, up to that many requests are dequeued at once and
+    returned as a list; otherwise a single request object is returned.
+    """
     capabilities = provider_info.provider_capabilities
-    provider_id = capabilities.provider_id
     
-    # Clean up inactive models and providers periodically
-    cleanup_inactive_models()
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + min(max(wait, 0.0), MAX_LONG_POLL_WAIT)
     
-    # Update provider tracking
-    active_providers[provider_id] = capabilities
-    provider_last_seen[provider_id] = time.time()
-    
-    # Find pending requests that this provider can handle
-    pending_requests = []
-    for req in inference_queue.values():
-        if req.status == InferenceStatus.PENDING:
-            # Check if provider supports the requested model
-            requested_model = req.request_data.get('model')
-            request_type = req.request_type
-            
-            if (requested_model in capabilities.supported_models and 
-                request_type in capabilities.request_types):
-                pending_requests.append(req)
-    
-    if not pending_requests:
-        raise HTTPException(status_code=204, detail="No pending requests for this provider")
-
-    # Get the oldest request this provider can handle
-    oldest_request = min(pending_requests, key=lambda x: x.created_at)
+    woken = asyncio.Event()
+    while True:
+        # Update provider tracking
+        track_provider(capabilities)
+        
+        dispatch_keys = provider_dispatch_keys[capabilities.provider_id]
+        batch = find_next_requests(dispatch_keys, max_requests or 1)
+        if batch:
+            break
+        
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            raise HTTPException(status_code=204, detail="No pending requests for this provider")
+        
+        # Nothing can be enqueued between the lookup above and registering here (no await)
+        woken.clear()
+        for key in dispatch_keys:
+            dispatch_waiters.setdefault(key, set()).add(woken)
+        try:
+            await asyncio.wait_for(woken.wait(), timeout=min(remaining, LONG_POLL_HEARTBEAT))
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            for key in dispatch_keys:
+                waiters = dispatch_waiters.get(key)
+                if waiters is not None:
+                    waiters.discard(woken)
+                    if not waiters:
+                        del dispatch_waiters[key]
     
     # Mark as processing
-    oldest_request.status = InferenceStatus.PROCESSING
-    oldest_request.started_at = datetime.now()
-    
-    return oldest_request
+    started_at = time.time()
+    for request in batch:
+        remove_pending(request)
+        set_status(request, InferenceStatus.PROCESSING)
+        request.started_at = started_at
+    
+    # Serialize once here rather than letting FastAPI validate and serialize again
+    if max_requests is None:
+        return Response(content=batch[0].model_dump_json(), media_type="application/json")
+    return Response(content=queued_requests_adapter.dump_json(batch), media_type="application/json")
 
 
 @app.post("/queue/result")
@@ -240,14 +570,58 @@ async def submit_inference_result(result: InferenceResult):
     queued_request = inference_queue[request_id]
     
     if result.error_message:
-        queued_request.status = InferenceStatus.FAILED
+        set_status(queued_request, InferenceStatus.FAILED)
         queued_request.error_message = result.error_message
     else:
-        queued_request.status = InferenceStatus.COMPLETED
+        set_status(queued_request, InferenceStatus.COMPLETED)
         # Store the result
         results_storage[request_id] = result.result_data
     
-    queued_request.completed_at = datetime.now()
+    queued_request.completed_at = time.time()
+    heapq.heappush(finished_requests, (queued_request.completed_at, request_id))
+    
+    # Wake up the client waiting on this request
+    done = completion_events.get(request_id)
+    if done is not None:
+        done.set()
+    chunks = stream_buffers.get(request_id)
+    if chunks is not None:
+        await chunks.put(None)
+    
+    return {"message": "Result submitted successfully", "request_id": request_id}
+
+
+@app.post("/queue/result/stream/{request_id}")
+async def submit_inference_result_stream(request_id: str, request: Request):
+    """Submit the result of a streaming request as a chunked request body.
+
+    Each body chunk is relayed to the waiting client as soon as it arrives.
+    Reading pauses while the client's buffer is full and stops for good once
+    the client has gone away.
+    """
+    if request_id not in inference_queue or request_id not in stream_buffers:
+        raise HTTPException(status_code=404, detail=f"Streaming request {request_id} not found")
+    
+    queued_request = inference_queue[request_id]
+    chunks = stream_buffers[request_id]
+    
+    try:
+        async for chunk in request.stream():
+            if not chunk:
+                continue
+            await chunks.put(chunk)
+            if stream_buffers.get(request_id) is not chunks:
+                # The client is gone; stop pulling the rest of the completion
+                return {"message": "Client disconnected, stream discarded", "request_id": request_id}
+        set_status(queued_request, InferenceStatus.COMPLETED)
+    except ClientDisconnect:
+        set_status(queued_request, InferenceStatus.FAILED)
+        queued_request.error_message = "Provider disconnected while streaming"
+    
+    queued_request.completed_at = time.time()
+    heapq.heappush(finished_requests, (queued_request.completed_at, request_id))
+    if stream_buffers.get(request_id) is chunks:
+        await chunks.put(None)
     
     return {"message": "Result submitted successfully", "request_id": request_id}
 
@@ -275,37 +649,40 @@ async def get_completion_result(request_id: str):
         raise HTTPException(status_code=500, detail="Unknown status")
 
 
-@app.get("/queue/stats", response_model=QueueStats)
+@app.get("/queue/stats", responses={200: {"model": QueueStats}})
 async def get_queue_stats():
     """Get queue statistics"""
-    stats = QueueStats()
-    
-    for request in inference_queue.values():
-        if request.status == InferenceStatus.PENDING:
-            stats.pending_requests += 1
-        elif request.status == InferenceStatus.PROCESSING:
-            stats.processing_requests += 1
-        elif request.status == InferenceStatus.COMPLETED:
-            stats.completed_requests += 1
-        elif request.status == InferenceStatus.FAILED:
-            stats.failed_requests += 1
-    
-    return stats
+    # Counters are maintained on every status transition, so this is O(1); the
+    # plain dict goes straight to orjson without a response_model round trip
+    return ORJSONResponse(content={
+        "pending_requests": status_counts[InferenceStatus.PENDING],
+        "processing_requests": status_counts[InferenceStatus.PROCESSING],
+        "completed_requests": status_counts[InferenceStatus.COMPLETED],
+        "failed_requests": status_counts[InferenceStatus.FAILED]
+    })
 
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint with cleanup statistics"""
-    cleanup_inactive_models()
-    
-    return {
-        "status": "healthy", 
-        "timestamp": int(time.time()),
-        "active_providers": len(active_providers),
-        "available_models": len(available_models),
-        "queued_requests": len(inference_queue)
-    }
+    """Health check endpoint with provider, model and queue counts"""
+    global health_response_key, health_response_cache
+
+    # Probes arrive many times per second; only re-serialize when the second or a counter changes
+    key = (health_timestamp, len(active_providers), len(available_models), len(inference_queue))
+    if key != health_response_key:
+        health_response_cache = (
+            b'{"status":"healthy","timestamp":%d,"active_providers":%d,"available_models":%d,"queued_requests":%d}'
+            % key
+        )
+        health_response_key = key
+
+    return Response(content=health_response_cache, media_type="application/json")
 
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # The queue, results and provider registry live in this process, so extra
+    # workers would each see only part of the traffic until state is shared.
+    workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+    if workers != 1:
+        print(f"WEB_CONCURRENCY={workers} ignored: queue state is in-process, running a single worker")
+    uvicorn.run("inferline.server:app", host="0.0.0.0", port=8000, workers=1, loop="uvloop", http="httptools")
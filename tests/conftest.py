@@ -1 +1,55 @@
+import httpx
 import pytest
+import pytest_asyncio
+
+from inferline import server
+
+
+@pytest.fixture(autouse=True)
+def reset_server_state():
+    """Give every test an empty queue and provider registry"""
+    for store in (
+        server.inference_queue,
+        server.pending_by_key,
+        server.results_storage,
+        server.stream_buffers,
+        server.completion_events,
+        server.provider_models,
+        server.available_models,
+        server.active_providers,
+        server.provider_last_seen,
+        server.provider_dispatch_keys,
+        server.dispatch_waiters,
+        server.unserved_models,
+    ):
+        store.clear()
+    server.finished_requests.clear()
+    server.status_counts.update(dict.fromkeys(server.InferenceStatus, 0))
+    server.active_model_ids = frozenset()
+    server.invalidate_models_cache()
+    yield
+
+
+@pytest_asyncio.fixture
+async def client():
+    """HTTP client talking to the app in-process"""
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+def poll_payload(provider_id="provider-1", models=("test-model",)):
+    """Body a provider sends to /queue/next"""
+    return {"provider_capabilities": {"provider_id": provider_id, "supported_models": list(models)}}
+
+
+def enqueue_completion(model="test-model", **fields):
+    """Put a non-streaming completion straight into the queue, as POST /completions would"""
+    request = server.QueuedInferenceRequest(
+        request_type="completion",
+        request_data={"model": model, "prompt": "Hello"},
+        request_model=model,
+        **fields
+    )
+    server.enqueue_request(request)
+    return request
@@ -0,0 +1,50 @@
+import asyncio
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from inferline.openai_provider import OpenAIProvider
+
+
+@pytest.mark.asyncio
+async def test_failed_poll_releases_slots_and_bounds_the_batch():
+    polls = []
+
+    async def queue_next(request):
+        polls.append(request.query["max"])
+        # The server answered, but the provider cannot decode the batch
+        return web.Response(body=b"not json", content_type="application/json")
+
+    app = web.Application()
+    app.router.add_post("/queue/next", queue_next)
+    inferline = TestServer(app)
+    await inferline.start_server()
+
+    provider = OpenAIProvider(
+        inferline_base_url=str(inferline.make_url("")),
+        poll_interval=0.01,
+        long_poll_timeout=0,
+        max_inflight=6,
+        max_batch_size=4
+    )
+    provider.session = aiohttp.ClientSession()
+    provider._inflight = asyncio.Semaphore(provider.max_inflight)
+    provider.running = True
+    loop_task = asyncio.create_task(provider._request_processing_loop())
+    try:
+        while len(polls) < 3:
+            await asyncio.sleep(0.01)
+    finally:
+        # Let the loop finish its current poll and exit on its own
+        provider.running = False
+        await asyncio.wait_for(loop_task, timeout=5)
+        await provider.session.close()
+        await inferline.close()
+
+    # Every poll asked for at most max_batch_size requests, which bounds what a failure strands
+    assert set(polls) == {"4"}
+    # Nothing was dispatched, so every slot went back
+    assert provider._inflight._value == provider.max_inflight
+    assert not provider._tasks
@@ -0,0 +1,23 @@
+import subprocess
+import sys
+
+import pytest
+
+
+def test_import_leaves_completion_request_schema_deferred():
+    # Fresh interpreter: other tests in this session have already built the schema
+    code = (
+        "import inferline\n"
+        "from inferline.schemas.openai import CompletionRequest\n"
+        "assert not CompletionRequest.__pydantic_complete__\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+@pytest.mark.asyncio
+async def test_completions_request_body_is_documented(client):
+    schema = (await client.get("/openapi.json")).json()
+
+    body = schema["paths"]["/completions"]["post"]["requestBody"]
+    assert body["required"] is True
+    assert "prompt" in body["content"]["application/json"]["schema"]["properties"]
@@ -0,0 +1,45 @@
+import pytest
+
+from inferline import openai_provider, server
+from inferline.openai_provider import OpenAIProvider
+from tests.conftest import enqueue_completion, poll_payload
+
+
+@pytest.mark.asyncio
+async def test_max_dequeues_oldest_requests_as_list(client):
+    oldest, middle, newest = (enqueue_completion(created_at=t) for t in (1.0, 2.0, 3.0))
+
+    response = await client.post("/queue/next", params={"max": 2}, json=poll_payload())
+    assert response.status_code == 200
+    batch = response.json()
+    assert [r["request_id"] for r in batch] == [oldest.request_id, middle.request_id]
+    assert all(r["status"] == "processing" for r in batch)
+
+    stats = (await client.get("/queue/stats")).json()
+    assert stats["pending_requests"] == 1
+    assert stats["processing_requests"] == 2
+    assert newest.status == server.InferenceStatus.PENDING
+
+
+@pytest.mark.asyncio
+async def test_without_max_a_single_object_is_returned(client):
+    request = enqueue_completion()
+
+    response = await client.post("/queue/next", json=poll_payload())
+    assert response.status_code == 200
+    assert response.json()["request_id"] == request.request_id
+
+
+@pytest.mark.asyncio
+async def test_max_above_server_limit_is_rejected(client):
+    enqueue_completion()
+
+    response = await client.post("/queue/next", params={"max": server.MAX_DEQUEUE_BATCH + 1}, json=poll_payload())
+    assert response.status_code == 422
+    assert (await client.get("/queue/stats")).json()["pending_requests"] == 1
+
+
+def test_provider_clamps_batch_size_to_server_limit():
+    assert openai_provider.MAX_DEQUEUE_BATCH == server.MAX_DEQUEUE_BATCH
+    assert OpenAIProvider(max_batch_size=200).max_batch_size == server.MAX_DEQUEUE_BATCH
+    assert OpenAIProvider(max_batch_size=0).max_batch_size == 1
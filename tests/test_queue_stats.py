@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from inferline import server
+from tests.conftest import enqueue_completion, poll_payload
+
+
+def stats(pending=0, processing=0, completed=0, failed=0):
+    return {
+        "pending_requests": pending,
+        "processing_requests": processing,
+        "completed_requests": completed,
+        "failed_requests": failed,
+    }
+
+
+@pytest.mark.asyncio
+async def test_counters_follow_status_transitions(client):
+    ok, broken, waiting = enqueue_completion(), enqueue_completion(), enqueue_completion()
+    assert (await client.get("/queue/stats")).json() == stats(pending=3)
+
+    response = await client.post("/queue/next", params={"max": 2}, json=poll_payload())
+    assert [r["request_id"] for r in response.json()] == [ok.request_id, broken.request_id]
+    assert (await client.get("/queue/stats")).json() == stats(pending=1, processing=2)
+
+    await client.post("/queue/result", json={"request_id": ok.request_id, "result_data": {"text": "hi"}})
+    await client.post("/queue/result", json={
+        "request_id": broken.request_id,
+        "result_data": {},
+        "error_message": "boom",
+    })
+    assert (await client.get("/queue/stats")).json() == stats(pending=1, completed=1, failed=1)
+
+    # Polling a result does not consume it
+    assert (await client.get(f"/completions/{ok.request_id}")).json() == {"text": "hi"}
+    assert (await client.get("/queue/stats")).json() == stats(pending=1, completed=1, failed=1)
+
+    server.drop_request(waiting.request_id)
+    assert (await client.get("/queue/stats")).json() == stats(completed=1, failed=1)
+
+
+@pytest.mark.asyncio
+async def test_counters_return_to_zero_once_results_are_collected(client):
+    completions = [
+        asyncio.create_task(client.post("/completions", json={"model": "test-model", "prompt": p}))
+        for p in ("one", "two")
+    ]
+    while len(server.inference_queue) < 2:
+        await asyncio.sleep(0)
+    response = await client.post("/queue/next", params={"max": 2}, json=poll_payload())
+    done, failed = response.json()
+
+    await client.post("/queue/result", json={"request_id": done["request_id"], "result_data": {"text": "hi"}})
+    await client.post("/queue/result", json={
+        "request_id": failed["request_id"],
+        "result_data": {},
+        "error_message": "boom",
+    })
+
+    codes = sorted(r.status_code for r in await asyncio.gather(*completions))
+    assert codes == [200, 500]
+    assert (await client.get("/queue/stats")).json() == stats()
+    assert not server.inference_queue
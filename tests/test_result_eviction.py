@@ -0,0 +1,59 @@
+import asyncio
+import time
+
+import pytest
+
+from inferline import server
+from tests.conftest import enqueue_completion, poll_payload
+
+
+ZERO_STATS = {"pending_requests": 0, "processing_requests": 0, "completed_requests": 0, "failed_requests": 0}
+
+
+@pytest.mark.asyncio
+async def test_timed_out_client_drops_its_request(client, monkeypatch):
+    monkeypatch.setattr(server, "COMPLETION_TIMEOUT", 0.05)
+
+    response = await client.post("/completions", json={"model": "test-model", "prompt": "Hello"})
+    assert response.status_code == 408
+
+    assert not server.inference_queue
+    assert not server.completion_events
+    assert (await client.get("/queue/stats")).json() == ZERO_STATS
+    # Nothing is left for a provider to pick up
+    assert (await client.post("/queue/next", json=poll_payload())).status_code == 204
+
+
+@pytest.mark.asyncio
+async def test_late_result_for_timed_out_request_is_rejected(client, monkeypatch):
+    monkeypatch.setattr(server, "COMPLETION_TIMEOUT", 0.2)
+
+    completion = asyncio.create_task(client.post("/completions", json={"model": "test-model", "prompt": "Hello"}))
+    queued = (await client.post("/queue/next", params={"wait": 5}, json=poll_payload())).json()
+    assert (await completion).status_code == 408
+
+    late = await client.post("/queue/result", json={"request_id": queued["request_id"], "result_data": {"text": "hi"}})
+    assert late.status_code == 404
+    assert not server.results_storage
+    assert (await client.get("/queue/stats")).json() == ZERO_STATS
+
+
+@pytest.mark.asyncio
+async def test_uncollected_results_are_evicted_after_ttl(client):
+    request = enqueue_completion()
+    await client.post("/queue/next", json=poll_payload())
+    await client.post("/queue/result", json={"request_id": request.request_id, "result_data": {"text": "hi"}})
+
+    # Still within the TTL: the result stays available
+    server.evict_expired_results()
+    assert (await client.get(f"/completions/{request.request_id}")).json() == {"text": "hi"}
+
+    # Age the finished entry past the TTL
+    server.finished_requests[0] = (time.time() - server.RESULT_TTL - 1, request.request_id)
+    server.evict_expired_results()
+
+    assert request.request_id not in server.inference_queue
+    assert request.request_id not in server.results_storage
+    assert not server.finished_requests
+    assert (await client.get(f"/completions/{request.request_id}")).status_code == 404
+    assert (await client.get("/queue/stats")).json() == ZERO_STATS
@@ -0,0 +1,193 @@
+import asyncio
+import json
+
+import pytest
+from starlette.requests import ClientDisconnect
+
+from inferline import server
+from tests.conftest import poll_payload
+
+
+STREAM_REQUEST = {"model": "test-model", "prompt": "Hello", "stream": True}
+
+ZERO_STATS = {"pending_requests": 0, "processing_requests": 0, "completed_requests": 0, "failed_requests": 0}
+
+
+async def dequeue_one(client):
+    """Long-poll /queue/next as a provider and return the request it hands out"""
+    response = await client.post("/queue/next", params={"wait": 5}, json=poll_payload())
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.mark.asyncio
+async def test_stream_chunks_are_relayed_to_client(client):
+    completion = asyncio.create_task(client.post("/completions", json=STREAM_REQUEST))
+    queued = await dequeue_one(client)
+    assert queued["request_data"]["stream"] is True
+
+    async def body():
+        for i in range(3):
+            yield f'data: {{"i": {i}}}\n\n'.encode()
+        yield b"data: [DONE]\n\n"
+
+    upload = await client.post(f"/queue/result/stream/{queued['request_id']}", content=body())
+    assert upload.status_code == 200
+
+    response = await completion
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.content == b'data: {"i": 0}\n\ndata: {"i": 1}\n\ndata: {"i": 2}\n\ndata: [DONE]\n\n'
+    assert (await client.get("/queue/stats")).json() == ZERO_STATS
+
+
+@pytest.mark.asyncio
+async def test_provider_failure_is_sent_as_sse_error(client):
+    completion = asyncio.create_task(client.post("/completions", json=STREAM_REQUEST))
+    queued = await dequeue_one(client)
+
+    result = await client.post("/queue/result", json={
+        "request_id": queued["request_id"],
+        "result_data": {},
+        "error_message": "upstream exploded",
+    })
+    assert result.status_code == 200
+
+    response = await completion
+    assert response.status_code == 200
+    assert response.content == b'data: {"error":"Processing failed: upstream exploded"}\n\n'
+    assert (await client.get("/queue/stats")).json() == ZERO_STATS
+
+
+def call_app_directly(receive, send, spec_version="2.3"):
+    """Run POST /completions against the ASGI app with our own receive/send.
+
+    httpx cannot hang up mid-response, so disconnects are driven by hand.
+    """
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": spec_version},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/completions",
+        "raw_path": b"/completions",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"test"), (b"content-type", b"application/json")],
+        "client": ("testclient", 50000),
+        "server": ("test", 80),
+    }
+    return asyncio.create_task(server.app(scope, receive, send))
+
+
+def disconnecting_receive(disconnected):
+    """ASGI receive that sends the request body, then http.disconnect once ``disconnected`` is set"""
+    body_sent = False
+
+    async def receive():
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {"type": "http.request", "body": json.dumps(STREAM_REQUEST).encode(), "more_body": False}
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    return receive
+
+
+@pytest.mark.asyncio
+async def test_client_disconnect_leaves_stats_at_zero(client):
+    disconnected = asyncio.Event()
+    first_chunk = asyncio.Event()
+
+    async def send(message):
+        if message["type"] == "http.response.body" and message.get("body"):
+            first_chunk.set()
+
+    app_call = call_app_directly(disconnecting_receive(disconnected), send)
+
+    queued = await dequeue_one(client)
+    assert (await client.get("/queue/stats")).json()["processing_requests"] == 1
+
+    finish_upload = asyncio.Event()
+
+    async def body():
+        yield b'data: {"i": 0}\n\n'
+        await finish_upload.wait()
+        yield b'data: {"i": 1}\n\n'
+
+    upload = asyncio.create_task(client.post(f"/queue/result/stream/{queued['request_id']}", content=body()))
+
+    await asyncio.wait_for(first_chunk.wait(), timeout=5)
+    disconnected.set()
+    await asyncio.wait_for(app_call, timeout=5)
+
+    assert queued["request_id"] not in server.inference_queue
+    assert (await client.get("/queue/stats")).json() == ZERO_STATS
+
+    # The provider finishing afterwards must not resurrect the request in the counters
+    finish_upload.set()
+    assert (await upload).status_code == 200
+    assert (await client.get("/queue/stats")).json() == ZERO_STATS
+
+
+@pytest.mark.asyncio
+async def test_slow_client_pauses_upload_and_disconnect_stops_it(client, monkeypatch):
+    monkeypatch.setattr(server, "STREAM_BUFFER_CHUNKS", 2)
+    disconnected = asyncio.Event()
+    first_chunk = asyncio.Event()
+
+    async def send(message):
+        if message["type"] == "http.response.body" and message.get("body"):
+            first_chunk.set()
+            # A client that never reads past the first chunk
+            await asyncio.Event().wait()
+
+    app_call = call_app_directly(disconnecting_receive(disconnected), send)
+    queued = await dequeue_one(client)
+
+    produced = 0
+
+    async def endless_body():
+        nonlocal produced
+        while True:
+            produced += 1
+            yield b'data: {"i": %d}\n\n' % produced
+
+    upload = asyncio.create_task(client.post(f"/queue/result/stream/{queued['request_id']}", content=endless_body()))
+    await asyncio.wait_for(first_chunk.wait(), timeout=5)
+    for _ in range(50):
+        await asyncio.sleep(0)
+
+    # The upload waits on the full buffer instead of reading the whole completion
+    assert not upload.done()
+    stalled_at = produced
+    assert stalled_at <= server.STREAM_BUFFER_CHUNKS + 3
+
+    disconnected.set()
+    await asyncio.wait_for(app_call, timeout=5)
+    response = await asyncio.wait_for(upload, timeout=5)
+
+    assert response.status_code == 200
+    assert response.json()["message"] == "Client disconnected, stream discarded"
+    assert produced <= stalled_at + 2
+    assert not server.stream_buffers
+    assert (await client.get("/queue/stats")).json() == ZERO_STATS
+
+
+@pytest.mark.asyncio
+async def test_client_gone_before_first_send_releases_request(client):
+    async def receive():
+        return {"type": "http.request", "body": json.dumps(STREAM_REQUEST).encode(), "more_body": False}
+
+    async def send(message):
+        raise OSError("client went away")
+
+    app_call = call_app_directly(receive, send, spec_version="2.4")
+    with pytest.raises(ClientDisconnect):
+        await asyncio.wait_for(app_call, timeout=5)
+
+    assert not server.stream_buffers
+    assert not server.inference_queue
+    assert (await client.get("/queue/stats")).json() == ZERO_STATS